@@ -17,16 +17,20 @@ Menu:
 """
 
 import os
+import re
+import csv
 import sys
+import atexit
 import sqlite3
+import threading
 from datetime import datetime
+from xml.sax.saxutils import escape
 
 import pandas as pd
-import matplotlib.pyplot as plt
 from tabulate import tabulate
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
+
+# matplotlib and reportlab are imported inside the chart/PDF functions so
+# that startup stays fast for the actions that never touch them.
 
 # =============== CONFIG ===============
 DB_FILE = "expenses.db"
@@ -34,14 +38,56 @@ REPORT_DIR = "reports"
 CHART_DIR = os.path.join(REPORT_DIR, "charts")
 MONTHLY_BUDGET = 5000.0  # change as you like
 CURRENCY = "₹"           # change to "$" or "€" etc.
+PAGE_SIZE = 50           # rows per screen in "View All Expenses"
+
+# =============== SQL ===============
+# All queries live here so the SQL can be read and changed in one place.
+SQL_INSERT = "INSERT INTO expenses (amount, category, date, description) VALUES (?, ?, ?, ?)"
+SQL_SELECT_ALL = "SELECT id, amount, category, date, description FROM expenses ORDER BY date DESC, id DESC"
+SQL_SELECT_PAGE = SQL_SELECT_ALL + " LIMIT ? OFFSET ?"
+SQL_BY_CAT = "SELECT id, amount, category, date, description FROM expenses WHERE category = ? ORDER BY date DESC, id DESC"
+SQL_BY_DATE = "SELECT id, amount, category, date, description FROM expenses WHERE date = ? ORDER BY id DESC"
+SQL_CAT_SUM = "SELECT category, SUM(amount) AS amount FROM expenses GROUP BY category ORDER BY 2 DESC"
+SQL_MONTHLY_SUM = "SELECT substr(date, 1, 7) AS month, SUM(amount) AS amount FROM expenses GROUP BY 1 ORDER BY 1"
+SQL_MONTH_TOTAL = "SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE date BETWEEN ? AND ?"
+SQL_HAS_ROWS = "SELECT 1 FROM expenses LIMIT 1"
+SQL_SIGNATURE = "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM expenses"
+EXPENSE_COLUMNS = ["id", "amount", "category", "date", "description"]
 
 # =============== SETUP ===============
 def ensure_dirs():
     os.makedirs(REPORT_DIR, exist_ok=True)
     os.makedirs(CHART_DIR, exist_ok=True)
 
+# Single connection reused for the life of the process.
+_CONN = None
+_CONN_LOCK = threading.Lock()
+
 def get_connection():
-    return sqlite3.connect(DB_FILE)
+    global _CONN
+    with _CONN_LOCK:
+        if _CONN is None:
+            _CONN = sqlite3.connect(DB_FILE, check_same_thread=False)
+            _CONN.execute("PRAGMA journal_mode=WAL")
+            _CONN.execute("PRAGMA synchronous=NORMAL")
+            _CONN.execute("PRAGMA temp_store=MEMORY")
+            atexit.register(_CONN.close)
+        return _CONN
+
+def _normalize_dates(conn):
+    # Older versions stored dates exactly as typed, and strptime accepted
+    # unpadded input like 2024-3-5. Month keys come from substr(date, 1, 7),
+    # so rewrite those rows as zero-padded YYYY-MM-DD.
+    rows = conn.execute(
+        "SELECT id, date FROM expenses WHERE date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'"
+    ).fetchall()
+    fixed = []
+    for row_id, date_s in rows:
+        try:
+            fixed.append((datetime.strptime(date_s.strip(), "%Y-%m-%d").strftime("%Y-%m-%d"), row_id))
+        except ValueError:
+            continue
+    conn.executemany("UPDATE expenses SET date = ? WHERE id = ?", fixed)
 
 def initialize_db():
     conn = get_connection()
@@ -57,26 +103,81 @@ def initialize_db():
         )
         """
     )
+    # One-time data fix-ups, tracked in the database's user_version
+    if cur.execute("PRAGMA user_version").fetchone()[0] < 1:
+        _normalize_dates(conn)
+        cur.execute("PRAGMA user_version = 1")
+    # idx_date, i.e. (date, rowid), serves ORDER BY date DESC, id DESC without
+    # a sort; the (column, amount) indexes cover the SUM queries. idx_cat is
+    # fully replaced by idx_cat_amt, so it is dropped from older databases.
+    indexes = {
+        "idx_date": "expenses(date)",
+        "idx_cat_amt": "expenses(category, amount)",
+        "idx_date_amt": "expenses(date, amount)",
+    }
+    existing = {row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    cur.execute("DROP INDEX IF EXISTS idx_cat")
+    for name, target in indexes.items():
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    # Gather planner stats only when an index is new, not on every launch
+    if not existing.issuperset(indexes):
+        cur.execute("ANALYZE")
     conn.commit()
-    conn.close()
 
 # =============== HELPERS ===============
+def query_df(sql, columns, params=()):
+    # The schema is fixed, so skip read_sql_query's per-call type inference.
+    rows = get_connection().execute(sql, params).fetchall()
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+# Process-wide copy of the expenses table; marked dirty on every write.
+_CACHE = {"df": None, "dirty": True}
+
 def fetch_all_df():
-    conn = get_connection()
-    df = pd.read_sql_query(
-        "SELECT id, amount, category, date, description FROM expenses ORDER BY date DESC, id DESC",
-        conn,
-    )
-    conn.close()
+    # The cached frame is shared between callers, so treat it as read-only.
+    if not _CACHE["dirty"]:
+        return _CACHE["df"]
+    df = query_df(SQL_SELECT_ALL, EXPENSE_COLUMNS)
+    _CACHE["df"] = df
+    _CACHE["dirty"] = False
     return df
 
+def fetch_category_totals():
+    return query_df(SQL_CAT_SUM, ["category", "amount"])
+
+def fetch_monthly_totals():
+    return query_df(SQL_MONTHLY_SUM, ["month", "amount"])
+
+_DATE_RE = re.compile(r"(?!0000)[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])")
+
 def valid_date_yyyy_mm_dd(date_str: str) -> bool:
+    m = _DATE_RE.fullmatch(date_str)
+    if not m:
+        return False
+    if int(m.group(2)) <= 28:
+        return True
+    # 29th-31st depend on the month (and leap years), let strptime decide
     try:
         datetime.strptime(date_str, "%Y-%m-%d")
         return True
     except ValueError:
         return False
 
+def _print_df(df):
+    # Pad whole columns at once rather than formatting cell by cell.
+    cells = df.fillna("").astype(str)
+    header, rule, lines = [], [], None
+    for col in cells.columns:
+        width = max(len(col), int(cells[col].str.len().max()))
+        numeric = pd.api.types.is_numeric_dtype(df[col])
+        padded = cells[col].str.rjust(width) if numeric else cells[col].str.ljust(width)
+        lines = padded if lines is None else lines + " | " + padded
+        header.append(col.rjust(width) if numeric else col.ljust(width))
+        rule.append("-" * width)
+    print(" | ".join(header))
+    print("-+-".join(rule))
+    print("\n".join(lines))
+
 def timestamp():
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -100,37 +201,51 @@ def add_expense():
     description = input("Enter description: ").strip()
 
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO expenses (amount, category, date, description) VALUES (?, ?, ?, ?)",
-        (amount, category, date_str, description),
-    )
+    conn.execute(SQL_INSERT, (amount, category, date_str, description))
     conn.commit()
-    conn.close()
+    _CACHE["dirty"] = True
     print("✅ Expense added successfully!")
 
     check_budget_alert_for_date(date_str)
 
+def add_expenses_bulk(rows):
+    """Insert (amount, category, date, description) tuples in one transaction.
+
+    Raises ValueError, before inserting anything, if a row's date is not a
+    valid YYYY-MM-DD string.
+    """
+    rows = list(rows)
+    for i, row in enumerate(rows):
+        date_s = row[2]
+        if not (isinstance(date_s, str) and valid_date_yyyy_mm_dd(date_s)):
+            raise ValueError(f"Row {i}: invalid date {date_s!r}, expected YYYY-MM-DD")
+    conn = get_connection()
+    with conn:
+        conn.executemany(SQL_INSERT, rows)
+    _CACHE["dirty"] = True
+
 def view_all_expenses():
-    df = fetch_all_df()
-    if df.empty:
-        print("No expenses found.\n")
-        return
-    print(tabulate(df, headers="keys", tablefmt="pretty", showindex=False))
-    print()
+    offset = 0
+    while True:
+        # One extra row tells us whether another page follows.
+        df = query_df(SQL_SELECT_PAGE, EXPENSE_COLUMNS, (PAGE_SIZE + 1, offset))
+        if df.empty:
+            print("No expenses found.\n")
+            return
+        _print_df(df.iloc[:PAGE_SIZE])
+        print()
+        if len(df) <= PAGE_SIZE:
+            return
+        offset += PAGE_SIZE
+        if input("Press Enter for more, or q to stop: ").strip().lower() == "q":
+            return
 
 def filter_by_category():
     category = input("Enter category to filter: ").strip()
     if not category:
         print("⚠  Please enter a category.")
         return
-    conn = get_connection()
-    df = pd.read_sql_query(
-        "SELECT id, amount, category, date, description FROM expenses WHERE category = ? ORDER BY date DESC, id DESC",
-        conn,
-        params=(category,),
-    )
-    conn.close()
+    df = query_df(SQL_BY_CAT, EXPENSE_COLUMNS, (category,))
     if df.empty:
         print("No expenses found for this category.\n")
         return
@@ -142,13 +257,7 @@ def filter_by_date():
     if not valid_date_yyyy_mm_dd(date_str):
         print("⚠  Invalid date format. Use YYYY-MM-DD.")
         return
-    conn = get_connection()
-    df = pd.read_sql_query(
-        "SELECT id, amount, category, date, description FROM expenses WHERE date = ? ORDER BY id DESC",
-        conn,
-        params=(date_str,),
-    )
-    conn.close()
+    df = query_df(SQL_BY_DATE, EXPENSE_COLUMNS, (date_str,))
     if df.empty:
         print("No expenses found for this date.\n")
         return
@@ -156,68 +265,83 @@ def filter_by_date():
     print()
 
 def monthly_summary():
-    df = fetch_all_df()
-    if df.empty:
+    rows = get_connection().execute(SQL_MONTHLY_SUM).fetchall()
+    if not rows:
         print("No expenses to summarize.\n")
         return
 
-    df["date"] = pd.to_datetime(df["date"])
-    df["month"] = df["date"].dt.to_period("M")
-    summary = df.groupby("month", as_index=False)["amount"].sum()
-    summary["month"] = summary["month"].astype(str)
-
     print("\n📅 Monthly Expense Summary:")
-    print(tabulate(summary, headers=["month", "amount"], tablefmt="pretty", showindex=False))
+    print(tabulate(rows, headers=["month", "amount"], tablefmt="pretty"))
 
-    latest = summary.iloc[-1]
-    latest_month = latest["month"]
-    latest_total = float(latest["amount"])
+    latest_month, latest_total = rows[-1]
     print(f"\nLatest month: {latest_month} — Total: {CURRENCY}{latest_total:,.2f}")
     if latest_total > MONTHLY_BUDGET:
         print("⚠ ALERT: Monthly budget exceeded!")
     print()
 
 # ---- Charts (both show and save PNG) ----
-def save_and_optionally_show(fig, filename, show=True):
+def chart_path(prefix):
     ensure_dirs()
-    path = os.path.join(CHART_DIR, filename)
+    return os.path.join(CHART_DIR, f"{prefix}_{timestamp()}.png")
+
+# Save-only (fig, ax) pairs, one per chart kind, cleared and redrawn each time.
+_FIGURES = {}
+
+def new_figure(kind, figsize, show=True):
+    # Save-only charts skip pyplot (and its GUI backend) entirely.
+    if show:
+        import matplotlib.pyplot as plt
+        return plt.subplots(figsize=figsize)
+    if kind in _FIGURES:
+        fig, ax = _FIGURES[kind]
+        ax.clear()
+        return fig, ax
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    _FIGURES[kind] = (fig, fig.subplots())
+    return _FIGURES[kind]
+
+def save_and_optionally_show(fig, path, show=True):
     fig.savefig(path, bbox_inches="tight")
     if show:
+        import matplotlib.pyplot as plt
         plt.show()
-    else:
-        plt.close(fig)
-    print(f"🖼  Chart saved to {path}")
     return path
 
+def _render_pie(cat_totals, path, show=False):
+    fig, ax = new_figure("pie", (7, 7), show=show)
+    ax.pie(cat_totals["amount"], labels=cat_totals["category"], autopct="%1.1f%%", startangle=90)
+    ax.set_title("Expense Distribution by Category")
+    return save_and_optionally_show(fig, path, show=show)
+
+def _render_bar(month_totals, path, show=False):
+    fig, ax = new_figure("bar", (9, 5), show=show)
+    ax.bar(month_totals["month"], month_totals["amount"])
+    ax.set_title("Monthly Spending Trends")
+    ax.set_xlabel("Month")
+    ax.set_ylabel(f"Total Spending ({CURRENCY})")
+    ax.tick_params(axis="x", labelrotation=45)
+    return save_and_optionally_show(fig, path, show=show)
+
 def show_pie_chart(show=True):
-    df = fetch_all_df()
-    if df.empty:
+    cat_totals = fetch_category_totals()
+    if cat_totals.empty:
         print("No expenses to plot.\n")
         return None
-    cat_sum = df.groupby("category")["amount"].sum().sort_values(ascending=False)
-    fig, ax = plt.subplots(figsize=(7, 7))
-    cat_sum.plot.pie(autopct="%1.1f%%", startangle=90, ax=ax)
-    ax.set_title("Expense Distribution by Category")
-    ax.set_ylabel("")
-    fname = f"pie_category_{timestamp()}.png"
-    return save_and_optionally_show(fig, fname, show=show)
+    path = _render_pie(cat_totals, chart_path("pie_category"), show=show)
+    print(f"🖼  Chart saved to {path}")
+    return path
 
 def show_bar_chart(show=True):
-    df = fetch_all_df()
-    if df.empty:
+    month_totals = fetch_monthly_totals()
+    if month_totals.empty:
         print("No expenses to plot.\n")
         return None
-    df["date"] = pd.to_datetime(df["date"])
-    df["month"] = df["date"].dt.to_period("M").astype(str)
-    month_sum = df.groupby("month")["amount"].sum().sort_index()
-    fig, ax = plt.subplots(figsize=(9, 5))
-    month_sum.plot(kind="bar", ax=ax)
-    ax.set_title("Monthly Spending Trends")
-    ax.set_xlabel("Month")
-    ax.set_ylabel(f"Total Spending ({CURRENCY})")
-    plt.xticks(rotation=45)
-    fname = f"bar_monthly_{timestamp()}.png"
-    return save_and_optionally_show(fig, fname, show=show)
+    path = _render_bar(month_totals, chart_path("bar_monthly"), show=show)
+    print(f"🖼  Chart saved to {path}")
+    return path
 
 def option_show_pie_chart():
     path = show_pie_chart(show=True)
@@ -230,119 +354,124 @@ def option_show_bar_chart():
         return
 
 # ---- Exports ----
+# Charts from the last PDF export, keyed on a cheap fingerprint of the table.
+_CHART_CACHE = {"sig": None, "pie": None, "bar": None}
+
 def export_to_csv():
     ensure_dirs()
-    df = fetch_all_df()
-    if df.empty:
+    conn = get_connection()
+    if conn.execute(SQL_HAS_ROWS).fetchone() is None:
         print("No expenses to export.\n")
         return
     filename = os.path.join(REPORT_DIR, f"expenses_{timestamp()}.csv")
-    df.to_csv(filename, index=False)
+    # Stream straight from the cursor so the table is never held in memory
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "amount", "category", "date", "description"])
+        writer.writerows(conn.execute(SQL_SELECT_ALL))
     print(f"✅ Data exported to {filename}")
 
 def export_to_pdf():
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.utils import ImageReader
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Image, Spacer
+
     ensure_dirs()
     df = fetch_all_df()
     if df.empty:
         print("No expenses to export.\n")
         return
 
-    # Generate fresh charts (saved, not shown)
-    pie_path = show_pie_chart(show=False)
-    bar_path = show_bar_chart(show=False)
+    # Reuse the previous export's charts unless the data has changed
+    cat_break = fetch_category_totals()
+    sig = get_connection().execute(SQL_SIGNATURE).fetchone()
+    pie_path, bar_path = _CHART_CACHE["pie"], _CHART_CACHE["bar"]
+    if sig != _CHART_CACHE["sig"] or not all(p and os.path.exists(p) for p in (pie_path, bar_path)):
+        pie_path = _render_pie(cat_break, chart_path("pie_category"))
+        bar_path = _render_bar(fetch_monthly_totals(), chart_path("bar_monthly"))
+        for path in (pie_path, bar_path):
+            print(f"🖼  Chart saved to {path}")
+        _CHART_CACHE.update(sig=sig, pie=pie_path, bar=bar_path)
 
     filename = os.path.join(REPORT_DIR, f"expenses_{timestamp()}.pdf")
-    c = canvas.Canvas(filename, pagesize=letter)
-    width, height = letter
     left = 50
-    y = height - 50
+    width, _ = letter
+    doc = SimpleDocTemplate(
+        filename, pagesize=letter,
+        leftMargin=left, rightMargin=left, topMargin=50, bottomMargin=50,
+    )
+    styles = getSampleStyleSheet()
+    body = styles["Normal"]
+    story = []
 
     # Header
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(left, y, "Expense Report")
-    y -= 22
-    c.setFont("Helvetica", 9)
-    c.drawString(left, y, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    y -= 18
+    story.append(Paragraph("Expense Report", styles["Heading1"]))
+    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", body))
+    story.append(Spacer(1, 8))
 
     # Totals
     total_amount = df["amount"].sum()
-    c.drawString(left, y, f"Total expenses: {CURRENCY}{total_amount:,.2f}")
-    y -= 16
+    story.append(Paragraph(f"Total expenses: {CURRENCY}{total_amount:,.2f}", body))
+    story.append(Spacer(1, 6))
 
     # Category breakdown
-    cat_break = df.groupby("category")["amount"].sum().reset_index().sort_values("amount", ascending=False)
-    c.drawString(left, y, "Category breakdown:")
-    y -= 14
-    for _, row in cat_break.iterrows():
-        c.drawString(left + 10, y, f"- {row['category']}: {CURRENCY}{row['amount']:,.2f}")
-        y -= 14
-        if y < 120:
-            c.showPage()
-            y = height - 50
-            c.setFont("Helvetica", 9)
+    story.append(Paragraph("Category breakdown:", body))
+    cats = cat_break["category"].astype(str).map(escape).to_numpy()
+    amts = (CURRENCY + cat_break["amount"].map("{:,.2f}".format)).to_numpy()
+    for cat, amt in zip(cats, amts):
+        story.append(Paragraph(f"- {cat}: {amt}", body))
+    story.append(Spacer(1, 12))
 
     # Insert charts if available
-    def add_image(path, y_current):
+    def chart_image(path):
+        img = ImageReader(path)
+        iw, ih = img.getSize()
+        max_w = width - 2*left
+        max_h = 250
+        scale = min(max_w / iw, max_h / ih)
+        return Image(path, width=iw * scale, height=ih * scale)
+
+    for path in (pie_path, bar_path):
         if path and os.path.exists(path):
-            img = ImageReader(path)
-            iw, ih = img.getSize()
-            max_w = width - 2*left
-            max_h = 250
-            scale = min(max_w / iw, max_h / ih)
-            w, h = iw * scale, ih * scale
-            if y_current - h < 80:
-                c.showPage()
-                y_current = height - 50
-            c.drawImage(path, left, y_current - h, width=w, height=h)
-            y_current -= (h + 20)
-        return y_current
-
-    y = add_image(pie_path, y)
-    y = add_image(bar_path, y)
+            story.append(chart_image(path))
+            story.append(Spacer(1, 20))
 
     # Details section
-    if y < 120:
-        c.showPage()
-        y = height - 50
-    c.drawString(left, y, "Details:")
-    y -= 12
-    c.setFont("Helvetica", 8)
-    c.drawString(left, y, f"{'Date':<12} {'Category':<15} {'Amount':<12} Description")
-    y -= 10
-    c.line(left, y + 6, width - left, y + 6)
-
-    for _, row in df.iterrows():
-        date_s = str(row["date"])
-        cat_s = str(row["category"])[:15]
-        amt_s = f"{CURRENCY}{row['amount']:,.2f}"
-        desc_s = (str(row["description"]) if row["description"] else "")[:70]
-        c.drawString(left, y, f"{date_s:<12} {cat_s:<15} {amt_s:<12} {desc_s}")
-        y -= 12
-        if y < 60:
-            c.showPage()
-            y = height - 50
-            c.setFont("Helvetica", 8)
-            c.drawString(left, y, f"{'Date':<12} {'Category':<15} {'Amount':<12} Description")
-            y -= 10
-            c.line(left, y + 6, width - left, y + 6)
-
-    c.save()
+    story.append(Paragraph("Details:", body))
+    date_col = df["date"].astype(str).to_numpy()
+    cat_col = df["category"].astype(str).str.slice(0, 15).to_numpy()
+    amt_col = (CURRENCY + df["amount"].map("{:,.2f}".format)).to_numpy()
+    desc_col = df["description"].fillna("").astype(str).str.slice(0, 70).to_numpy()
+    header = ["Date", "Category", "Amount", "Description"]
+    rows = [[date_s, cat_s, amt_s, desc_s] for date_s, cat_s, amt_s, desc_s in zip(date_col, cat_col, amt_col, desc_col)]
+    col_widths = [60, 90, 70, width - 2*left - 220]
+    table_style = TableStyle([
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 8),
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 8),
+        ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.black),
+        ("ALIGN", (2, 1), (2, -1), "RIGHT"),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ])
+    # One page-sized Table per chunk: Platypus re-splits a single huge Table
+    # at every page break, which made layout grow faster than linearly.
+    rows_per_table = 40
+    for i in range(0, len(rows), rows_per_table):
+        table = Table([header] + rows[i:i + rows_per_table], colWidths=col_widths, repeatRows=1, hAlign="LEFT")
+        table.setStyle(table_style)
+        story.append(table)
+
+    doc.build(story)
     print(f"✅ PDF exported to {filename}")
 
 # =============== BUDGET ALERT ===============
 def check_budget_alert_for_date(date_str: str):
-    try:
-        when = pd.to_datetime(date_str)
-    except Exception:
-        return
-    df = fetch_all_df()
-    if df.empty:
-        return
-    df["date"] = pd.to_datetime(df["date"])
-    df["month"] = df["date"].dt.to_period("M")
-    month = when.to_period("M")
-    total_month = df[df["month"] == month]["amount"].sum()
+    # date_str is already validated as YYYY-MM-DD, so the month is its prefix
+    month_prefix = date_str[:7]
+    total_month = get_connection().execute(
+        SQL_MONTH_TOTAL, (month_prefix + "-01", month_prefix + "-31")
+    ).fetchone()[0]
     if total_month > MONTHLY_BUDGET:
         print("⚠ ALERT: Monthly budget exceeded!")
 